@@ -24,6 +24,10 @@ GREEN_LED_PIN = 12 # smallest leg
 RED_BUTTON_PIN = 28
 RED_LED_PIN = 15 # 2nd largest leg 
 
+# Clock probe (ping/pong) so Server can measure Wi-Fi round trip and clock offset
+PROBE_INTERVAL_MS = 30000
+PROBE_TIMEOUT = 1 # seconds
+
 # ==================== WiFi Connection ==================
 def connect_wifi():
     wlan = network.WLAN(network.STA_IF)
@@ -63,6 +67,51 @@ def register_device(sock):
     print("Registration failed after 3 attempts")
     raise RuntimeError("Registration timeout")
 
+# ==================== Server Messages ==================
+def handle_server_message(decoded):
+    global red_active, green_active
+    # Server may ask to turn off LED
+    if decoded.startswith("LED_OFF"):
+        color = decoded.split(':')[1].lower()
+        if color == 'red':
+            red_led.off()
+            red_active = False
+            print("Server: Red LED turned off")
+        elif color == 'green':
+            green_led.off()
+            green_active = False
+            print("Server: Green LED turned off")
+
+# ==================== Clock Probe ======================
+def probe_server(sock):
+    # Wait here (not in the main loop) so the 1s loop sleep doesn't inflate the RTT
+    t1 = time.ticks_ms()
+    sock.settimeout(PROBE_TIMEOUT)
+    try:
+        sock.sendto(f"PING:{t1}".encode(), (SERVER_IP, SERVER_PORT))
+        while True:
+            data, _ = sock.recvfrom(128)
+            t4 = time.ticks_ms()
+            decoded = data.decode().strip()
+            # PONG:<t1>,t2:<host ms>,t3:<host ms>
+            if decoded.startswith(f"PONG:{t1},"):
+                fields = decoded.split(',')
+                t2 = fields[1].split(':')[1]
+                t3 = fields[2].split(':')[1]
+                # Server does the offset math, its clock numbers are too big for Pico floats
+                message = f"SYNC:ID:{device_id},t1:{t1},t2:{t2},t3:{t3},t4:{t4}"
+                sock.sendto(message.encode(), (SERVER_IP, SERVER_PORT))
+                return True
+            handle_server_message(decoded)  # Don't lose an LED_OFF that came in meanwhile
+    except OSError:
+        print("Probe timed out")  # Lost ping/pong, try again next interval
+        return False
+    except Exception as e:
+        print("Probe error:", e)  # Bad datagram only costs this probe
+        return False
+    finally:
+        sock.settimeout(0)
+
 # ==================== Part 1. Main Program =====================
 try:
     # Initialize hardware
@@ -110,22 +159,20 @@ try:
         green_led.off()
         time.sleep(0.3)
     green_led.off()
+
+    probe_server(sock)
+    last_probe = time.ticks_ms()
         
     while True:
+        # [0] Re-measure link every so often, Wi-Fi quality drifts during a lab
+        if time.ticks_diff(time.ticks_ms(), last_probe) >= PROBE_INTERVAL_MS:
+            probe_server(sock)
+            last_probe = time.ticks_ms()
+
         # [1] Check for server messages, Server may ask to turn off LED
         try:
             data, _ = sock.recvfrom(1024)
-            decoded = data.decode().strip()
-            if decoded.startswith("LED_OFF"):
-                color = decoded.split(':')[1].lower()
-                if color == 'red':
-                    red_led.off()
-                    red_active = False
-                    print("Server: Red LED turned off")
-                elif color == 'green':
-                    green_led.off()
-                    green_active = False
-                    print("Server: Green LED turned off")
+            handle_server_message(data.decode().strip())
         except OSError as e:
             if e.args[0] == 11:  # EAGAIN (no data available)
                 pass  # Normal non-blocking behavior
@@ -138,6 +185,9 @@ try:
         # [2] Handle button presses
         green_pressed = green_button.is_pressed()
         red_pressed = red_button.is_pressed()
+        # Time the loop noticed the press (up to 1s after it happened), station clock.
+        # Server converts it with its offset, so latency is counted from press detection
+        pressed_at = time.ticks_ms()
         status = None
 
         # Handle simultaneous press first
@@ -165,7 +215,7 @@ try:
         # Send status update
         if status:
             try:
-                message = f"ID:{device_id},status:{status}"
+                message = f"ID:{device_id},status:{status},t:{pressed_at}"
                 sock.sendto(message.encode(), (SERVER_IP, SERVER_PORT))
             except Exception as e:
                 print(f"Send error: {str(e)}")
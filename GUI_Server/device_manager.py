@@ -1,6 +1,18 @@
+import statistics
 import time
 from threading import Lock
 
+# Clock sync tuning: keep the last few ping/pong samples per station and flag
+# a station whose typical round trip is slower than this (lab Wi-Fi is ~10 ms)
+SYNC_WINDOW = 8
+POOR_LINK_RTT_MS = 250
+# Anything past this is a bad offset, not a real press-to-display time
+MAX_LATENCY_MS = 60000
+
+# Host clock in whole milliseconds, same unit the stations report in.
+# Monotonic so an NTP step on the Pi doesn't throw off the station offsets
+def now_ms():
+    return int(time.monotonic() * 1000)
 
 class DeviceManager:
     def __init__(self):
@@ -14,18 +26,81 @@ class DeviceManager:
                 'priority': 'Relaxing',
                 'last_seen': time.time(),
                 'address' : None,
-                'last_color': None
+                'last_color': None,
+                'sync_samples': [],     # (t1, rtt_ms, offset_ms) from ping/pong
+                'rtt_ms': None,
+                'clock_offset_ms': None,  # host clock - station clock
+                'poor_link': False,
+                'pressed_at': None,     # press time on host clock, waiting for display
+                'latency_ms': None      # last press-to-display latency
             }
     # New device? assign a Status, priority, and time
-    def update_device(self, device_id, status):
+    # station_ms = when the station detected the press, on its own clock (newer stations only)
+    def update_device(self, device_id, status, station_ms=None):
         with self.lock:
             if device_id in self.devices:
                 self.devices[device_id]['status'] = status.lower()
                 self.devices[device_id]['priority'] = 'Need Help' if status.lower() == 'red' else 'Check Off'
                 self.devices[device_id]['last_seen'] = time.time()
+                if station_ms is not None:
+                    self._record_press(self.devices[device_id], station_ms)
     # Resets or make this default button display
     def set_offline(self, device_id):
         with self.lock:
             if device_id in self.devices:
                 self.devices[device_id]['status'] = 'off'
-                self.devices[device_id]['priority'] = 'Relaxing'
\ No newline at end of file
+                self.devices[device_id]['priority'] = 'Relaxing'
+
+    # NTP-style estimate from one ping/pong exchange.
+    # t1/t4 = station send/receive (station ms), t2/t3 = host receive/send (host ms)
+    # Returns (old, new) poor_link so the caller can report only changes
+    def record_sync(self, device_id, t1, t2, t3, t4):
+        with self.lock:
+            if device_id not in self.devices:
+                return False, False
+            device = self.devices[device_id]
+            was_poor = device['poor_link']
+            rtt = (t4 - t1) - (t3 - t2)
+            offset = ((t2 - t1) + (t3 - t4)) // 2
+            if rtt < 0:
+                return was_poor, was_poor  # Station tick counter wrapped mid-exchange, drop it
+
+            samples = device['sync_samples']
+            # Station ticks went backwards (reboot or wrap), old offsets are useless
+            if samples and t1 < samples[-1][0]:
+                samples.clear()
+            samples.append((t1, rtt, offset))
+            del samples[:-SYNC_WINDOW]
+
+            # Fastest exchange has the least queuing delay, so trust its offset
+            _, _, best_offset = min(samples, key=lambda s: s[1])
+            device['rtt_ms'] = rtt
+            device['clock_offset_ms'] = best_offset
+            device['poor_link'] = statistics.median(s[1] for s in samples) > POOR_LINK_RTT_MS
+            return was_poor, device['poor_link']
+
+    # Station stamped the press on its own clock, move it onto the host clock.
+    # Caller must hold self.lock
+    def _record_press(self, device, station_ms):
+        samples = device['sync_samples']
+        # Ticks went backwards (reboot or wrap) since the last probe, offset is stale
+        if samples and station_ms < samples[-1][0]:
+            samples.clear()
+            device['clock_offset_ms'] = None
+        if device['clock_offset_ms'] is None:
+            return  # Not synced yet, can't tell when the press happened
+        device['pressed_at'] = station_ms + device['clock_offset_ms']
+
+    # GUI has drawn the press it saw as pressed_at, close it out.
+    # A newer press that came in after the GUI's snapshot stays pending
+    def mark_displayed(self, device_id, pressed_at):
+        with self.lock:
+            device = self.devices.get(device_id)
+            if device is None or pressed_at is None or device['pressed_at'] != pressed_at:
+                return None
+            device['pressed_at'] = None
+            latency = now_ms() - pressed_at
+            if not 0 <= latency <= MAX_LATENCY_MS:
+                return None  # Offset was off, don't report garbage
+            device['latency_ms'] = latency
+            return latency
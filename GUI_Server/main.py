@@ -234,11 +234,11 @@ class GUI:
         
         # Get device statuses for coloring
         with self.device_manager.lock:
-            status_snapshot = [(d['status'], d['priority']) for d in self.device_manager.devices.values()]
+            status_snapshot = [(d['status'], d['priority'], d['poor_link'], d['pressed_at']) for d in self.device_manager.devices.values()]
 
         # Update box colors and positions
         for new_idx, device_id in enumerate(ordered_ids):
-            status, priority = status_snapshot[device_id-1]
+            status, priority, poor_link, pressed_at = status_snapshot[device_id-1]
 
             # FIX: Update color (based on feedback) 
             """
@@ -253,6 +253,9 @@ class GUI:
                 fill_color = 'white'
                 
             self.canvas.itemconfig(self.box_ids[device_id-1], fill=fill_color)
+
+            # Orange outline = station's Wi-Fi round trip is too slow to trust
+            self.canvas.itemconfig(self.box_ids[device_id-1], outline='orange' if poor_link else 'black')
             
             # FIX: Issue where Font did not display correct size 
             self.canvas.itemconfig(self.box_texts[device_id-1], text=str(device_id))
@@ -287,6 +290,11 @@ class GUI:
             text_y = (y1 + y2) / 2
             self.canvas.coords(self.box_texts[device_id-1], text_x, text_y)
 
+            # Box is drawn with the snapshot, so the press captured there is now on screen
+            latency = self.device_manager.mark_displayed(device_id, pressed_at)
+            if latency is not None:
+                print(f"Device {device_id}: press-to-display {latency} ms")
+
         self.master.after(1000, self.update_display)
 
 # ======================= MAIN QUEUE ACTION FI-TAC (First in, TA Chooses)====================================
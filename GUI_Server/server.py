@@ -3,7 +3,7 @@ import re
 from socket import *
 
 import pygame
-from device_manager import DeviceManager
+from device_manager import DeviceManager, now_ms
 
 SERVER_PORT = 12000
 
@@ -27,16 +27,35 @@ def udp_server(device_manager: DeviceManager):
     try:
         while True:
             message, addr = sock.recvfrom(2048)
+            received_at = now_ms()
             decoded = message.decode().strip()
+
+            # Clock probe from a station: echo its t1 with our receive/send times
+            ping = re.match(r'PING:(\d+)', decoded)
+            if ping:
+                sock.sendto(f"PONG:{ping.group(1)},t2:{received_at},t3:{now_ms()}".encode(), addr)
+                continue
+
+            # Station reporting back all 4 timestamps of a finished probe
+            sync = re.match(r'SYNC:ID:(\d+),t1:(\d+),t2:(\d+),t3:(\d+),t4:(\d+)', decoded)
+            if sync:
+                device_id, t1, t2, t3, t4 = (int(g) for g in sync.groups())
+                was_poor, is_poor = device_manager.record_sync(device_id, t1, t2, t3, t4)
+                if is_poor != was_poor:
+                    print(f"Device {device_id}: Wi-Fi link {'poor' if is_poor else 'recovered'}")
+                continue
+
             print(f"Received from {addr}: {decoded}")
 
-            # Use to extract device ID and status
-            match = re.match(r'ID:(\d+),status:(red|green|off)', decoded, re.IGNORECASE)
+            # Use to extract device ID, status and (newer stations) press time
+            match = re.match(r'ID:(\d+),status:(red|green|off)(?:,t:(\d+))?', decoded, re.IGNORECASE)
             if match:
                 try:
                     device_id = int(match.group(1))
                     status = match.group(2).lower()
                     
+                    station_ms = int(match.group(3)) if match.group(3) else None
+                    
                     if 1 <= device_id <= 30:
                         with device_manager.lock:
                             device = device_manager.devices[device_id]
@@ -47,7 +66,7 @@ def udp_server(device_manager: DeviceManager):
                                 device['last_color'] = None
 
                         if status in ['red', 'green']:
-                            device_manager.update_device(device_id, status)
+                            device_manager.update_device(device_id, status, station_ms)
                             play_notification()
                         elif status == 'off':
                             device_manager.set_offline(device_id)